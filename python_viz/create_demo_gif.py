@@ -1,73 +1,199 @@
 #!/usr/bin/env python3
 """
 Create demo GIF for multi-robot exploration showing individual robot maps
+
+Requires matplotlib (GIFs are encoded with Pillow, which matplotlib already depends on)
 """
 
 import subprocess
 import matplotlib
 matplotlib.use('Agg')  # Use headless backend for GIF creation
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 from matplotlib.patches import Rectangle
+from matplotlib.collections import PatchCollection
+import numpy as np
+from PIL import Image
 import os
 import sys
 import re
+import glob
+import tempfile
+import hashlib
+import multiprocessing
+import signal
+import threading
+from dataclasses import dataclass
+
+# Simulation output patterns, compiled once for the per-line parse loop
+# (matched against raw bytes so stdout never needs decoding)
+_TICK_RE = re.compile(rb'=== Tick (\d+)')
+_ROBOT_LINE_RE = re.compile(rb'Robot (\d+): .*pos=\((\d+),\s*(\d+)\).*phase=(\w+)')
+_MAP_ROW_RE = re.compile(rb'[#. R]*')  # Unexplored cells print as spaces, so rows may be blank
+
+# Cell colors for explored map areas
+OBSTACLE_RGB = (64, 64, 64)    # Gray for obstacles
+EMPTY_RGB = (192, 192, 192)    # Light gray for explored empty space
+BORDER_RGBA = (1.0, 1.0, 1.0, 1.0)     # White outline around explored cells
+NO_BORDER_RGBA = (0.0, 0.0, 0.0, 0.0)
+
+@dataclass
+class FramesSoA:
+    """Parsed simulation frames as struct-of-arrays, indexed [frame, robot, ...]"""
+    ticks: np.ndarray        # (F,) int32 tick numbers
+    positions: np.ndarray    # (F, R, 2) int32 robot (x, y)
+    phases: np.ndarray       # (F, R) int16 index into phase_names, -1 if the robot is absent
+    phase_names: np.ndarray  # (P,) phase name strings
+    maps: np.ndarray         # (F, R, H, W) uint8 map characters, padded with spaces
+    
+    def __len__(self):
+        return len(self.ticks)
+    
+    @property
+    def n_robots(self):
+        return self.phases.shape[1]
+    
+    def has_robot(self, frame_idx, robot_id):
+        return robot_id < self.n_robots and self.phases[frame_idx, robot_id] >= 0
+    
+    def phase(self, frame_idx, robot_id):
+        return str(self.phase_names[self.phases[frame_idx, robot_id]])
 
-def run_simulation_from_root():
-    """Run simulation from the project root directory"""
+# Parsed frames are cached here (relative to the project root), keyed on map, seed and simulator source
+CACHE_DIR = '.cache'
+FRAMES_FORMAT_VERSION = 2  # Bump whenever parse_simulation_data or the FramesSoA layout changes
+SIMULATION_SOURCES = ['Cargo.toml', 'Cargo.lock', 'src/**/*.rs']
+SIMULATION_TIMEOUT = 120  # seconds, for the build and the run together
+
+def run_simulation_from_root(map_file='maps/sample_room.map', seed=42):
+    """Run simulation from the project root directory, parsing its output as it streams"""
     print("🚀 Running complex room simulation...")
     
     # Change to project root
     os.chdir('..')
     
-    # Run the simulation
-    result = subprocess.run([
-        './run_simulation.sh', '--map_file', 'maps/sample_room.map', '--seed', '42'
-    ], capture_output=True, text=True, timeout=120)
+    # The simulator prints exactly one line per map row
+    with open(map_file, 'rb') as f:
+        map_height = sum(1 for line in f if line.strip())
+    
+    # Reuse frames from a previous run of the same map, seed and simulator source
+    cache_path = frames_cache_path(map_file, seed)
+    if os.path.exists(cache_path):
+        print(f"📦 Using cached frames: {cache_path}")
+        return load_frames(cache_path)
     
-    print(f"Simulation completed with return code: {result.returncode}")
-    print(f"Output length: {len(result.stdout)} characters")
+    # Run the simulation; stderr goes to a temp file so a chatty cargo build can't fill the pipe
+    # stdout stays binary; the parser works on bytes and only decodes phase names
+    with tempfile.TemporaryFile() as stderr_file:
+        with subprocess.Popen([
+            './run_simulation.sh', '--map_file', map_file, '--seed', str(seed)
+        ], stdout=subprocess.PIPE, stderr=stderr_file, start_new_session=True) as proc:
+            # The deadline covers the streaming read too: a hung simulator (or the
+            # visualization window it opens at the end) would otherwise block the parse forever
+            deadline = threading.Timer(SIMULATION_TIMEOUT, _kill_process_group, args=(proc,))
+            deadline.start()
+            try:
+                frames = parse_simulation_data(proc.stdout, map_height)
+                returncode = proc.wait(timeout=SIMULATION_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                _kill_process_group(proc)
+                returncode = proc.wait()
+            finally:
+                deadline.cancel()
+        
+        if returncode == -signal.SIGKILL:
+            print(f"⏱️  Simulation killed after {SIMULATION_TIMEOUT}s timeout")
+        print(f"Simulation completed with return code: {returncode}")
+        
+        if returncode != 0:
+            stderr_file.seek(0)
+            print("Stderr:", stderr_file.read(500).decode(errors='replace'))
+            return None
     
-    if result.returncode != 0:
-        print("Stderr:", result.stderr[:500])
-        return None
+    # Don't cache a run that produced nothing to animate
+    if len(frames) > 0:
+        save_frames(cache_path, frames)
+    return frames
+
+def _kill_process_group(proc):
+    """Kill run_simulation.sh together with the cargo/simulator processes it started"""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass  # Already exited
+
+def frames_cache_path(map_file, seed):
+    """Cache file for the parsed frames of a map file, seed, simulator source and frames format"""
+    with open(map_file, 'rb') as f:
+        map_hash = hashlib.sha1(f.read()).hexdigest()
     
-    return result.stdout
+    # Hash the sources rather than the binary: run_simulation.sh rebuilds after this lookup
+    source_hash = hashlib.sha1()
+    for pattern in SIMULATION_SOURCES:
+        for path in sorted(glob.glob(pattern, recursive=True)):
+            source_hash.update(path.encode())
+            with open(path, 'rb') as f:
+                source_hash.update(f.read())
+    return os.path.join(CACHE_DIR, f'frames_v{FRAMES_FORMAT_VERSION}_{map_hash}_{seed}_{source_hash.hexdigest()[:16]}.npz')
 
-def parse_simulation_data(output_text):
-    """Parse simulation output to extract robot positions and maps"""
-    lines = output_text.split('\n')
+def save_frames(path, frames):
+    """Save parsed frames as compressed arrays"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez_compressed(path, ticks=frames.ticks, positions=frames.positions, phases=frames.phases,
+                        phase_names=frames.phase_names, maps=frames.maps)
+
+def load_frames(path):
+    """Load frames saved by save_frames"""
+    with np.load(path) as data:
+        return FramesSoA(ticks=data['ticks'], positions=data['positions'], phases=data['phases'],
+                         phase_names=data['phase_names'], maps=data['maps'])
+
+def parse_simulation_data(lines, map_height=None):
+    """Parse simulation output lines (bytes) to extract robot positions and maps.
+    
+    Each map block is read one line per row, up to map_height rows when it is known,
+    and ends early at the first line that is not a map row (the next section).
+    """
     frames = []
     current_frame = None
+    map_robot_id = None  # Robot whose map block is being read
+    map_lines = []
     
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
+    for raw_line in lines:
+        # Read map rows, keeping blank and space-led ones so the rows below stay aligned
+        if map_robot_id is not None:
+            map_line = raw_line.rstrip(b'\r\n')
+            if (map_height is None or len(map_lines) < map_height) and _MAP_ROW_RE.fullmatch(map_line):
+                map_lines.append(map_line)
+                continue
+            
+            # Store map for this robot, then parse this line normally
+            if current_frame and map_robot_id in current_frame['robots']:
+                current_frame['robots'][map_robot_id]['map'] = map_lines
+            map_robot_id = None
+        
+        line = raw_line.strip()
         
         # Parse tick header
-        if line.startswith('=== Tick'):
+        tick_match = _TICK_RE.match(line)
+        if tick_match:
             # Save previous frame if it exists
             if current_frame and current_frame['robots']:
                 frames.append(current_frame)
             
-            tick_num = int(line.split()[2])
+            tick_num = int(tick_match.group(1))
             current_frame = {
                 'tick': tick_num,
                 'robots': {}
             }
             
         # Parse robot position and phase
-        elif line.startswith('Robot') and 'pos=' in line and 'phase=' in line:
-            robot_part, data_part = line.split(': ', 1)
-            robot_id = int(robot_part.split()[1])
+        elif line.startswith(b'Robot') and b'pos=' in line:
+            robot_match = _ROBOT_LINE_RE.match(line)
             
-            # Parse position and phase
-            pos_match = re.search(r'pos=\((\d+),\s*(\d+)\)', data_part)
-            phase_match = re.search(r'phase=(\w+)', data_part)
-            
-            if pos_match and phase_match:
-                x, y = int(pos_match.group(1)), int(pos_match.group(2))
-                phase = phase_match.group(1)
+            if robot_match:
+                robot_id = int(robot_match.group(1))
+                x, y = int(robot_match.group(2)), int(robot_match.group(3))
+                phase = robot_match.group(4).decode('ascii')
                 
                 current_frame['robots'][robot_id] = {
                     'id': robot_id,
@@ -78,160 +204,296 @@ def parse_simulation_data(output_text):
                 }
         
         # Parse robot map
-        elif line.startswith("Robot") and "'s map:" in line:
-            robot_id = int(line.split()[1].rstrip("'s"))
-            
-            # Read map lines
-            i += 1
+        elif line.startswith(b'Robot') and b"'s map:" in line:
+            map_robot_id = int(line.split()[1].rstrip(b"'s"))
             map_lines = []
-            while i < len(lines) and not lines[i].startswith('Robot') and not lines[i].startswith('===') and lines[i].strip():
-                map_line = lines[i].rstrip()
-                if map_line and len(map_line) > 0:
-                    map_lines.append(map_line)
-                i += 1
-            i -= 1  # Back up one line
-            
-            # Store map for this robot
-            if current_frame and robot_id in current_frame['robots']:
-                current_frame['robots'][robot_id]['map'] = map_lines
-        
-        # End of parsing - save final frame
-        elif i == len(lines) - 1 and current_frame and current_frame['robots']:
-            frames.append(current_frame)
-        
-        i += 1
     
-    return frames
+    # Output may end inside a map block
+    if map_robot_id is not None and current_frame and map_robot_id in current_frame['robots']:
+        current_frame['robots'][map_robot_id]['map'] = map_lines
+    
+    # End of parsing - save final frame
+    if current_frame and current_frame['robots']:
+        frames.append(current_frame)
+    
+    return frames_to_soa(frames)
 
-def create_robot_maps_gif(frames, output_file="complex_room_exploration.gif"):
-    """Create animated GIF showing both robots' individual maps side by side"""
+def frames_to_soa(frames):
+    """Pack a list of per-tick frame dicts into a FramesSoA"""
+    robots = [robot_data for frame_data in frames for robot_data in frame_data['robots'].values()]
+    n_robots = max((robot_data['id'] for robot_data in robots), default=-1) + 1
+    map_height = max((len(robot_data['map']) for robot_data in robots), default=0)
+    map_width = max((len(line) for robot_data in robots for line in robot_data['map']), default=0)
+    phase_names = sorted({robot_data['phase'] for robot_data in robots})
     
-    if not frames:
-        print("❌ No frames to animate")
-        return
+    ticks = np.array([frame_data['tick'] for frame_data in frames], dtype=np.int32)
+    positions = np.zeros((len(frames), n_robots, 2), dtype=np.int32)
+    phases = np.full((len(frames), n_robots), -1, dtype=np.int16)
+    maps = np.full((len(frames), n_robots, map_height, map_width), ord(' '), dtype=np.uint8)
+    
+    for frame_idx, frame_data in enumerate(frames):
+        for robot_id, robot_data in frame_data['robots'].items():
+            positions[frame_idx, robot_id] = robot_data['x'], robot_data['y']
+            phases[frame_idx, robot_id] = phase_names.index(robot_data['phase'])
+            if robot_data['map']:
+                map_bytes = map_to_bytes(robot_data['map'])
+                maps[frame_idx, robot_id, :map_bytes.shape[0], :map_bytes.shape[1]] = map_bytes
+    
+    return FramesSoA(ticks=ticks, positions=positions, phases=phases,
+                     phase_names=np.array(phase_names, dtype=str), maps=maps)
+
+def map_to_bytes(robot_map):
+    """Convert a robot's map lines (bytes) into a (height, width) uint8 array of map characters"""
+    width = max(len(line) for line in robot_map)
+    raw = b''.join(line.ljust(width) for line in robot_map)
+    return np.frombuffer(raw, dtype=np.uint8).reshape(len(robot_map), width)
+
+def make_palette(robot_rgb):
+    """Map character byte -> RGB lookup table for one robot's map"""
+    palette = np.zeros((256, 3), dtype=np.uint8)  # Unexplored cells stay black
+    palette[ord('#')] = OBSTACLE_RGB
+    palette[ord('.')] = EMPTY_RGB
+    palette[ord('R')] = robot_rgb
+    return palette
+
+def paint_map(map_bytes, robot_pos, out_rgb, palette):
+    """Paint a robot map into out_rgb so that its 'R' marker lands on robot_pos.
+    
+    Colors come from a make_palette table. The map is clipped to out_rgb.
+    Returns False if the map has no robot marker.
+    """
+    # argmax stops at the first True without building an index array
+    robot_cells = map_bytes == ord('R')
+    robot_idx = int(robot_cells.argmax())
+    if not robot_cells.flat[robot_idx]:
+        return False
     
-    print(f"🎬 Creating animation with {len(frames)} frames")
+    # Offset from map coordinates to out_rgb coordinates
+    robot_map_y, robot_map_x = divmod(robot_idx, map_bytes.shape[1])
+    offset_x = robot_pos[0] - robot_map_x
+    offset_y = robot_pos[1] - robot_map_y
+    
+    h, w = map_bytes.shape
+    out_h, out_w = out_rgb.shape[:2]
+    x0, y0 = max(0, -offset_x), max(0, -offset_y)
+    x1, y1 = min(w, out_w - offset_x), min(h, out_h - offset_y)
+    if x0 >= x1 or y0 >= y1:
+        return True
+    
+    # One gather through the palette, written straight into the destination window
+    out_rgb[offset_y + y0:offset_y + y1, offset_x + x0:offset_x + x1] = palette[map_bytes[y0:y1, x0:x1]]
+    return True
+
+def select_frames(frames, min_change=2, keyframe_every=10):
+    """Pick the frame indices worth rendering.
+    
+    A frame is kept when, compared with the last kept frame, the robots have moved
+    and explored at least min_change cells in total or changed phase. The first and
+    last frames are always kept, plus a keyframe at least every keyframe_every frames.
+    """
+    explored = np.count_nonzero(frames.maps != ord(' '), axis=(2, 3))
+    positions = frames.positions.astype(np.int64)
+    
+    keep = [0]
+    for frame_idx in range(1, len(frames)):
+        last_idx = keep[-1]
+        change = (np.abs(explored[frame_idx] - explored[last_idx]).sum()
+                  + np.abs(positions[frame_idx] - positions[last_idx]).sum())
+        
+        if (change >= min_change
+                or frame_idx - last_idx >= keyframe_every
+                or frame_idx == len(frames) - 1
+                or not np.array_equal(frames.phases[frame_idx], frames.phases[last_idx])):
+            keep.append(frame_idx)
+    
+    return keep
+
+def frame_digest(frames, frame_idx):
+    """Hash of everything a frame's panels show; equal digests differ only in the tick number"""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(frames.maps[frame_idx].tobytes())
+    digest.update(frames.positions[frame_idx].tobytes())
+    digest.update(frames.phases[frame_idx].tobytes())
+    return digest.digest()
+
+class RobotMapsFigure:
+    """Side-by-side panels of each robot's own map, reused across frames"""
     
     # Fixed map bounds based on the actual map file (sample_room.map is 20x11)
     # These bounds should encompass the entire possible exploration area
     min_x, max_x = 0, 20
     min_y, max_y = 0, 11
-    MAP_WIDTH = max_x - min_x
-    MAP_HEIGHT = max_y - min_y
     
-    # Create figure with subplots for each robot
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
-    fig.suptitle('Multi-Robot Exploration: Individual Robot Maps', fontsize=16, fontweight='bold')
+    # Colors for robots
+    robot_colors = ['#FF4444', '#4444FF']  # Red and Blue
+    robot_rgb = [(255, 68, 68), (68, 68, 255)]
     
-    def animate(frame_idx):
-        ax1.clear()
-        ax2.clear()
-        
-        if frame_idx >= len(frames):
-            frame_idx = len(frames) - 1
+    def __init__(self):
+        self.palettes = [make_palette(rgb) for rgb in self.robot_rgb]
+        map_width = self.max_x - self.min_x
+        map_height = self.max_y - self.min_y
         
-        frame_data = frames[frame_idx]
+        # Create figure with subplots for each robot
+        self.fig, axes = plt.subplots(1, 2, figsize=(16, 8))
+        self.suptitle = self.fig.suptitle('Multi-Robot Exploration: Individual Robot Maps',
+                                          fontsize=16, fontweight='bold')
         
-        # Colors for robots
-        robot_colors = ['#FF4444', '#4444FF']  # Red and Blue
-        
-        for subplot_idx, (robot_id, ax) in enumerate([(0, ax1), (1, ax2)]):
-            # Set black background for fog of war effect
+        # One RGB raster per robot, uploaded once per frame instead of one patch per cell
+        self.imgs = [np.zeros((map_height, map_width, 3), dtype=np.uint8) for _ in axes]
+        self.ims = []
+        self.titles = []
+        self.borders = []
+        for ax, img in zip(axes, self.imgs):
+            # Black background for fog of war effect (unexplored cells stay zero)
             ax.set_facecolor('#000000')
+            self.ims.append(ax.imshow(img, origin='lower', extent=(self.min_x, self.max_x, self.min_y, self.max_y),
+                                      interpolation='nearest'))
             
-            # Only draw explored areas (fog of war effect)
-            if robot_id in frame_data['robots']:
-                robot_data = frame_data['robots'][robot_id]
-                robot_map = robot_data['map']
-                
-                if robot_map:
-                    # Find the robot's position to determine map offset
-                    robot_pos_x, robot_pos_y = robot_data['x'], robot_data['y']
-                    
-                    # Find robot position in the map to calculate offset
-                    robot_map_x, robot_map_y = None, None
-                    for y, line in enumerate(robot_map):
-                        for x, char in enumerate(line):
-                            if char == 'R':
-                                robot_map_x, robot_map_y = x, y
-                                break
-                        if robot_map_x is not None:
-                            break
-                    
-                    # Calculate offset from map coordinates to world coordinates
-                    if robot_map_x is not None and robot_map_y is not None:
-                        offset_x = robot_pos_x - robot_map_x
-                        offset_y = robot_pos_y - robot_map_y
-                        
-                        # Draw only the cells that have been explored
-                        for y, line in enumerate(robot_map):
-                            for x, char in enumerate(line):
-                                # Only draw if this cell has been explored (not space/unexplored)
-                                if char in ['#', '.', 'R']:
-                                    # Determine cell color based on character
-                                    if char == '#':
-                                        color = '#404040'  # Gray for obstacles
-                                    elif char == '.':
-                                        color = '#C0C0C0'  # Light gray for explored empty space
-                                    elif char == 'R':
-                                        color = robot_colors[robot_id]  # Robot color for robot position
-                                    
-                                    # Calculate world coordinates using offset
-                                    world_x = x + offset_x
-                                    world_y = y + offset_y
-                                    
-                                    rect = Rectangle((world_x, world_y), 1, 1, 
-                                                   facecolor=color, edgecolor='white', linewidth=0.5)
-                                    ax.add_patch(rect)
+            # Cell borders as one collection in img's row-major order; only explored cells get an edge
+            cells = [Rectangle((x, y), 1, 1)
+                     for y in range(self.min_y, self.max_y) for x in range(self.min_x, self.max_x)]
+            self.borders.append(ax.add_collection(PatchCollection(cells, facecolors='none', edgecolors='none',
+                                                                  linewidths=0.5)))
+            self.titles.append(ax.set_title('', fontsize=12, fontweight='bold'))
             
             # Set fixed bounds for stable viewport
-            ax.set_xlim(min_x, max_x)
-            ax.set_ylim(min_y, max_y)
+            ax.set_xlim(self.min_x, self.max_x)
+            ax.set_ylim(self.min_y, self.max_y)
             ax.set_aspect('equal')
+            ax.set_xticks([])
+            ax.set_yticks([])
+    
+    def paint(self, frames, frame_idx):
+        """Update all artists for one frame without drawing the canvas"""
+        for robot_id, (img, im, title, border) in enumerate(zip(self.imgs, self.ims, self.titles, self.borders)):
+            img.fill(0)
             
-            # Set title with robot info
-            if robot_id in frame_data['robots']:
-                robot_data = frame_data['robots'][robot_id]
-                ax.set_title(f'Robot {robot_id} - {robot_data["phase"]}\\n'
-                           f'Position: ({robot_data["x"]}, {robot_data["y"]})', 
-                           fontsize=12, fontweight='bold', color=robot_colors[robot_id])
+            # Only draw explored areas (fog of war effect)
+            if frames.has_robot(frame_idx, robot_id):
+                map_bytes = frames.maps[frame_idx, robot_id]
+                robot_x, robot_y = (int(v) for v in frames.positions[frame_idx, robot_id])
+                
+                if map_bytes.size:
+                    paint_map(map_bytes, (robot_x - self.min_x, robot_y - self.min_y), img, self.palettes[robot_id])
+                
+                # Set title with robot info
+                title.set_text(f'Robot {robot_id} - {frames.phase(frame_idx, robot_id)}\\n'
+                               f'Position: ({robot_x}, {robot_y})')
+                title.set_color(self.robot_colors[robot_id])
             else:
                 # No data for this robot
-                ax.set_title(f'Robot {robot_id} - No Data', fontsize=12, color='gray')
+                title.set_text(f'Robot {robot_id} - No Data')
+                title.set_color('gray')
             
-            ax.set_xticks([])
-            ax.set_yticks([])
+            im.set_data(img)
+            explored = img.any(axis=2).reshape(-1, 1)
+            border.set_edgecolors(np.where(explored, BORDER_RGBA, NO_BORDER_RGBA))
         
         # Add tick info
-        fig.suptitle(f'Multi-Robot Exploration - Tick {frame_data["tick"]}\\n'
-                    f'Algorithm: Iterative Boundary Trace & Coordinated Sweep', 
-                    fontsize=14, fontweight='bold')
+        self.suptitle.set_text(f'Multi-Robot Exploration - Tick {frames.ticks[frame_idx]}\\n'
+                               f'Algorithm: Iterative Boundary Trace & Coordinated Sweep')
+        self.suptitle.set_fontsize(14)
+    
+    def render(self):
+        """Draw the canvas and return it as an RGB uint8 array"""
+        self.fig.canvas.draw()
+        return np.asarray(self.fig.canvas.buffer_rgba())[..., :3].copy()
+
+# Frames sampled to build the palette shared by the whole GIF
+PALETTE_SAMPLE_FRAMES = 8
+
+# Below this many rendered frames, building a figure in every worker costs more than it saves
+PARALLEL_MIN_FRAMES = 64
+
+# Per-process state for render_frame, set up once by _init_render_worker
+_worker_frames = None
+_worker_figure = None
+
+def _init_render_worker(frames):
+    global _worker_frames, _worker_figure
+    _worker_frames = frames
+    _worker_figure = RobotMapsFigure()
+
+def render_frame(frame_idx):
+    """Render one frame to an RGB uint8 array in a pool worker"""
+    _worker_figure.paint(_worker_frames, frame_idx)
+    return _worker_figure.render()
+
+def save_gif(output_file, rgb_frames, durations):
+    """Write RGB uint8 frames as a looping GIF with one palette shared by all frames"""
+    # Quantize a mosaic of evenly spaced frames once, instead of letting Pillow build a palette per frame
+    sample = rgb_frames[::max(1, len(rgb_frames) // PALETTE_SAMPLE_FRAMES)][:PALETTE_SAMPLE_FRAMES]
+    palette = Image.fromarray(np.concatenate(sample)).quantize(colors=256)
+    
+    images = [Image.fromarray(frame).quantize(palette=palette, dither=Image.Dither.NONE)
+              for frame in rgb_frames]
+    images[0].save(output_file, save_all=True, append_images=images[1:], duration=durations, loop=0)
+
+def create_robot_maps_gif(frames, output_file="complex_room_exploration.gif", min_change=2, keyframe_every=10,
+                          processes=None):
+    """Create animated GIF showing both robots' individual maps side by side"""
+    
+    if not frames:
+        print("❌ No frames to animate")
+        return
+    
+    # Skipped ticks extend the duration of the kept frame before them
+    frame_indices = select_frames(frames, min_change, keyframe_every)
+    print(f"🎬 Creating animation with {len(frame_indices)} of {len(frames)} frames")
+    
+    # Fold runs of frames where nothing but the tick number changed into one longer frame
+    tick_duration = 500  # ms, 2 fps
+    render_indices = []
+    durations = []
+    last_digest = None
+    for frame_idx, next_idx in zip(frame_indices, frame_indices[1:] + [len(frames)]):
+        frame_duration = (next_idx - frame_idx) * tick_duration
+        
+        digest = frame_digest(frames, frame_idx)
+        if digest == last_digest:
+            durations[-1] += frame_duration
+            continue
+        last_digest = digest
+        
+        render_indices.append(frame_idx)
+        durations.append(frame_duration)
+    
+    if len(render_indices) < len(frame_indices):
+        print(f"🗜️  Collapsed {len(frame_indices) - len(render_indices)} unchanged frames")
+    
+    # Canvas draws dominate and each frame is independent, so spread long animations over worker processes
+    if processes is None:
+        processes = (os.cpu_count() or 1) if len(render_indices) >= PARALLEL_MIN_FRAMES else 1
+    processes = min(processes, len(render_indices))
     
-    # Create animation
-    anim = animation.FuncAnimation(fig, animate, frames=len(frames), 
-                                 interval=500, repeat=True, blit=False)
+    if processes > 1:
+        with multiprocessing.Pool(processes, initializer=_init_render_worker, initargs=(frames,)) as pool:
+            gif_frames = list(pool.imap(render_frame, render_indices, chunksize=8))
+    else:
+        figure = RobotMapsFigure()
+        gif_frames = []
+        for frame_idx in render_indices:
+            figure.paint(frames, frame_idx)
+            gif_frames.append(figure.render())
+        plt.close(figure.fig)
     
     # Save GIF
     print(f"💾 Saving GIF: {output_file}")
-    writer = animation.PillowWriter(fps=2)
-    anim.save(output_file, writer=writer)
+    save_gif(output_file, gif_frames, durations)
     print(f"✅ Created: {output_file}")
     
-    plt.close()
     return output_file
 
 def main():
     print("🎬 Multi-Robot Exploration Demo GIF Creator")
     print("=" * 50)
     
-    # Run simulation
-    output = run_simulation_from_root()
-    if not output:
+    # Run simulation and parse its output
+    frames = run_simulation_from_root()
+    if frames is None:
         print("❌ Failed to get simulation output")
         return
     
-    # Parse data
-    frames = parse_simulation_data(output)
     if not frames:
         print("❌ No animation frames found")
         return
@@ -7,8 +7,13 @@ import subprocess
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from matplotlib.patches import Rectangle
+from matplotlib.collections import PatchCollection
+import numpy as np
 import re
 
+# Robot status line, compiled once for the per-line parse loop
+_LINE_RE = re.compile(r'Robot (\d+):\s*pos=\((\d+),\s*(\d+)\)')
+
 def run_simulation_and_capture():
     """Run simulation and capture enough output for visualization"""
     print("🚀 Running simulation...")
@@ -31,11 +36,10 @@ def run_simulation_and_capture():
     except:
         process.kill()
     
-    return '\n'.join(output_lines)
+    return output_lines
 
-def parse_simple_data(output_text):
-    """Parse basic tick and robot position data"""
-    lines = output_text.split('\n')
+def parse_simple_data(lines):
+    """Parse basic tick and robot position data from simulation output lines"""
     data = []
     current_tick = None
     robots = {}
@@ -56,18 +60,14 @@ def parse_simple_data(output_text):
         
         # Parse robot positions  
         elif line.startswith('Robot') and 'pos=' in line:
-            parts = line.split()
-            robot_id = int(parts[1].rstrip(':'))
-            
-            # Extract position
-            pos_part = [p for p in parts if p.startswith('pos=')][0]
-            pos_coords = pos_part.split('=')[1].strip('()')
-            x, y = map(int, pos_coords.split(','))
-            
-            robots[robot_id] = {
-                'id': robot_id,
-                'position': (x, y)
-            }
+            robot_match = _LINE_RE.match(line)
+            if robot_match:
+                robot_id, x, y = int(robot_match[1]), int(robot_match[2]), int(robot_match[3])
+                
+                robots[robot_id] = {
+                    'id': robot_id,
+                    'position': (x, y)
+                }
     
     # Add final tick
     if current_tick is not None and robots:
@@ -83,46 +83,57 @@ def create_simple_gif(data, map_width=12, map_height=5, output_file="simple_expl
     
     fig, ax = plt.subplots(figsize=(10, 6))
     
-    def animate(frame):
-        ax.clear()
+    # Draw grid background once as a single collection; it never changes between frames
+    cells = [Rectangle((x, map_height - y - 1), 1, 1)
+             for x in range(map_width) for y in range(map_height)]
+    ax.add_collection(PatchCollection(cells, facecolors='lightgray', edgecolors='black', linewidths=0.5))
+    
+    # Persistent robot artists, moved by animate
+    colors = ['red', 'blue']
+    markers = {}
+    labels = {}
+    for robot_id in sorted({robot['id'] for tick_data in data for robot in tick_data['robots']}):
+        markers[robot_id] = ax.scatter([], [], 
+                                       c=colors[robot_id], s=300, marker='o', 
+                                       edgecolors='black', linewidth=2, zorder=10)
         
+        labels[robot_id] = ax.text(0, 0, str(robot_id), 
+                                   ha='center', va='center', fontweight='bold', 
+                                   fontsize=12, color='white', zorder=11, visible=False)
+    
+    ax.set_xlim(0, map_width)
+    ax.set_ylim(0, map_height)
+    ax.set_aspect('equal')
+    title = ax.set_title('', fontsize=14, fontweight='bold')
+    ax.set_xticks([])
+    ax.set_yticks([])
+    
+    def animate(frame):
         if frame >= len(data):
             frame = len(data) - 1
             
         tick_data = data[frame]
         
-        # Draw grid background
-        for x in range(map_width):
-            for y in range(map_height):
-                rect = Rectangle((x, map_height - y - 1), 1, 1, 
-                               facecolor='lightgray', edgecolor='black', linewidth=0.5)
-                ax.add_patch(rect)
-        
         # Draw robots
-        colors = ['red', 'blue']
-        for robot in tick_data['robots']:
-            x, y = robot['position']
-            robot_id = robot['id']
-            
-            ax.scatter(x + 0.5, map_height - y - 0.5, 
-                      c=colors[robot_id], s=300, marker='o', 
-                      edgecolors='black', linewidth=2, zorder=10)
-            
-            ax.text(x + 0.5, map_height - y - 0.5, str(robot_id), 
-                   ha='center', va='center', fontweight='bold', 
-                   fontsize=12, color='white', zorder=11)
+        positions = {robot['id']: robot['position'] for robot in tick_data['robots']}
+        for robot_id, marker in markers.items():
+            if robot_id in positions:
+                x, y = positions[robot_id]
+                center = (x + 0.5, map_height - y - 0.5)
+                marker.set_offsets([center])
+                labels[robot_id].set_position(center)
+                labels[robot_id].set_visible(True)
+            else:
+                marker.set_offsets(np.empty((0, 2)))
+                labels[robot_id].set_visible(False)
+        
+        title.set_text(f'Multi-Robot Exploration - Tick {tick_data["tick"]}')
         
-        ax.set_xlim(0, map_width)
-        ax.set_ylim(0, map_height)
-        ax.set_aspect('equal')
-        ax.set_title(f'Multi-Robot Exploration - Tick {tick_data["tick"]}', 
-                    fontsize=14, fontweight='bold')
-        ax.set_xticks([])
-        ax.set_yticks([])
+        return (*markers.values(), *labels.values(), title)
     
     # Create animation
     anim = animation.FuncAnimation(fig, animate, frames=len(data), 
-                                 interval=500, repeat=True)
+                                 interval=500, repeat=True, blit=True)
     
     # Save as GIF
     print(f"💾 Saving GIF: {output_file}")
@@ -142,7 +153,7 @@ def main():
         print("❌ No simulation output captured")
         return
     
-    print(f"📊 Captured {len(output.split('\\n'))} lines of output")
+    print(f"📊 Captured {len(output)} lines of output")
     
     # Parse data
     data = parse_simple_data(output)
@@ -7,12 +7,27 @@ Creates animated GIFs showing robot movement and map discovery.
 import json
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
-from matplotlib.patches import Rectangle
+from matplotlib.colors import ListedColormap
 import numpy as np
 import argparse
 from pathlib import Path
 import subprocess
 import sys
+import re
+
+# Simulation output patterns, compiled once for the per-line parse loop
+# (matched against raw bytes so stdout never needs decoding)
+_TICK_RE = re.compile(rb'=== Tick (\d+)')
+_ROBOT_LINE_RE = re.compile(rb'Robot (\d+): .*pos=\((\d+),\s*(\d+)\).*phase=(\w+)')
+
+# Cell state codes stored in each robot's (height, width) uint8 map
+CELL_UNEXPLORED, CELL_EMPTY, CELL_OBSTACLE = 0, 1, 2
+
+# Map character byte -> cell state code
+_CELL_CODES = np.full(256, CELL_UNEXPLORED, dtype=np.uint8)
+_CELL_CODES[ord('.')] = CELL_EMPTY
+_CELL_CODES[ord('R')] = CELL_EMPTY  # Robot position is empty space
+_CELL_CODES[ord('#')] = CELL_OBSTACLE
 
 class ExplorationVisualizer:
     def __init__(self, simulation_data, map_width, map_height):
@@ -35,62 +50,83 @@ class ExplorationVisualizer:
     def create_animation(self, output_path="exploration.gif", interval=200):
         """Create animated GIF showing exploration progress"""
         
-        def animate(frame):
-            self.ax.clear()
+        # Cell state code -> color, indexed by CELL_UNEXPLORED/CELL_EMPTY/CELL_OBSTACLE
+        cell_cmap = ListedColormap([self.colors['unexplored'], self.colors['empty'], self.colors['obstacle']])
+        
+        # Merge all robot maps once per tick instead of per cell per frame
+        merged_maps = [self.merge_robot_maps(tick_data) for tick_data in self.data]
+        
+        # Persistent artists, updated in place by animate
+        self.im = self.ax.imshow(merged_maps[0], cmap=cell_cmap, vmin=CELL_UNEXPLORED, vmax=CELL_OBSTACLE,
+                                 origin='upper', extent=(0, self.map_width, 0, self.map_height),
+                                 interpolation='nearest')
+        self.ax.vlines(range(self.map_width + 1), 0, self.map_height, colors='white', linewidth=0.5)
+        self.ax.hlines(range(self.map_height + 1), 0, self.map_width, colors='white', linewidth=0.5)
+        
+        robot_ids = sorted({robot['id'] for tick_data in self.data for robot in tick_data['robots']})
+        self.robot_markers = {}
+        self.robot_labels = {}
+        for robot_id in robot_ids:
+            # Robot position
+            self.robot_markers[robot_id] = self.ax.scatter(
+                [], [], c=self.colors[f'robot{robot_id}'], s=200, marker='o',
+                edgecolors='black', linewidth=2, zorder=10)
             
+            # Robot ID label
+            self.robot_labels[robot_id] = self.ax.text(
+                0, 0, str(robot_id), ha='center', va='center',
+                fontweight='bold', fontsize=12, zorder=11, visible=False)
+        
+        # Set up the plot
+        self.ax.set_xlim(0, self.map_width)
+        self.ax.set_ylim(0, self.map_height)
+        self.ax.set_aspect('equal')
+        self.title = self.ax.set_title('', fontsize=14, fontweight='bold')
+        
+        # Add legend
+        legend_elements = [
+            plt.Rectangle((0, 0), 1, 1, facecolor=self.colors['unexplored'], label='Unexplored'),
+            plt.Rectangle((0, 0), 1, 1, facecolor=self.colors['empty'], label='Explored'),
+            plt.Rectangle((0, 0), 1, 1, facecolor=self.colors['obstacle'], label='Obstacle'),
+            plt.scatter([], [], c=self.colors['robot0'], s=100, label='Robot 0'),
+            plt.scatter([], [], c=self.colors['robot1'], s=100, label='Robot 1')
+        ]
+        self.ax.legend(handles=legend_elements, loc='upper right', bbox_to_anchor=(1.15, 1))
+        
+        # Remove ticks
+        self.ax.set_xticks([])
+        self.ax.set_yticks([])
+        
+        def animate(frame):
             if frame >= len(self.data):
                 frame = len(self.data) - 1
                 
             tick_data = self.data[frame]
             
             # Draw map grid
-            for y in range(self.map_height):
-                for x in range(self.map_width):
-                    cell_type = self.get_cell_state(tick_data, x, y)
-                    color = self.colors[cell_type]
-                    
-                    rect = Rectangle((x, self.map_height - y - 1), 1, 1, 
-                                   facecolor=color, edgecolor='white', linewidth=0.5)
-                    self.ax.add_patch(rect)
+            self.im.set_data(merged_maps[frame])
             
             # Draw robot positions
-            for robot in tick_data['robots']:
-                x, y = robot['position']
-                robot_id = robot['id']
-                color = self.colors[f'robot{robot_id}']
-                
-                # Robot position
-                self.ax.scatter(x + 0.5, self.map_height - y - 0.5, 
-                              c=color, s=200, marker='o', edgecolors='black', linewidth=2, zorder=10)
-                
-                # Robot ID label
-                self.ax.text(x + 0.5, self.map_height - y - 0.5, str(robot_id), 
-                           ha='center', va='center', fontweight='bold', fontsize=12, zorder=11)
-            
-            # Set up the plot
-            self.ax.set_xlim(0, self.map_width)
-            self.ax.set_ylim(0, self.map_height)
-            self.ax.set_aspect('equal')
-            self.ax.set_title(f'Multi-Robot Exploration - Tick {tick_data["tick"]} - Phase: {tick_data["phase"]}', 
-                            fontsize=14, fontweight='bold')
+            positions = {robot['id']: robot['position'] for robot in tick_data['robots']}
+            for robot_id, marker in self.robot_markers.items():
+                label = self.robot_labels[robot_id]
+                if robot_id in positions:
+                    x, y = positions[robot_id]
+                    center = (x + 0.5, self.map_height - y - 0.5)
+                    marker.set_offsets([center])
+                    label.set_position(center)
+                    label.set_visible(True)
+                else:
+                    marker.set_offsets(np.empty((0, 2)))
+                    label.set_visible(False)
             
-            # Add legend
-            legend_elements = [
-                plt.Rectangle((0, 0), 1, 1, facecolor=self.colors['unexplored'], label='Unexplored'),
-                plt.Rectangle((0, 0), 1, 1, facecolor=self.colors['empty'], label='Explored'),
-                plt.Rectangle((0, 0), 1, 1, facecolor=self.colors['obstacle'], label='Obstacle'),
-                plt.scatter([], [], c=self.colors['robot0'], s=100, label='Robot 0'),
-                plt.scatter([], [], c=self.colors['robot1'], s=100, label='Robot 1')
-            ]
-            self.ax.legend(handles=legend_elements, loc='upper right', bbox_to_anchor=(1.15, 1))
+            self.title.set_text(f'Multi-Robot Exploration - Tick {tick_data["tick"]} - Phase: {tick_data["phase"]}')
             
-            # Remove ticks
-            self.ax.set_xticks([])
-            self.ax.set_yticks([])
+            return (self.im, *self.robot_markers.values(), *self.robot_labels.values(), self.title)
             
         # Create animation
         anim = animation.FuncAnimation(self.fig, animate, frames=len(self.data), 
-                                     interval=interval, repeat=True, blit=False)
+                                     interval=interval, repeat=True, blit=True)
         
         # Save as GIF
         print(f"Creating GIF animation: {output_path}")
@@ -99,33 +135,45 @@ class ExplorationVisualizer:
         
         return anim
     
-    def get_cell_state(self, tick_data, x, y):
-        """Determine the state of a cell based on robot maps"""
-        # Check robot maps for this position
-        for robot in tick_data['robots']:
-            robot_map = robot['map']
-            idx = y * self.map_width + x
-            if idx < len(robot_map):
-                if robot_map[idx] == 'Obstacle':
-                    return 'obstacle'
-                elif robot_map[idx] == 'Empty':
-                    return 'empty'
+    def merge_robot_maps(self, tick_data):
+        """Combine all robot maps for a tick into one (height, width) state grid"""
+        robot_maps = [robot['map'] for robot in tick_data['robots']]
+        if not robot_maps:
+            return np.zeros((self.map_height, self.map_width), dtype=np.uint8)
         
-        return 'unexplored'
+        # Codes are ordered so the most informative state wins
+        return np.maximum.reduce(robot_maps)
+
+class Peek:
+    """Iterator wrapper with one item of lookahead; yields None once exhausted"""
+    
+    def __init__(self, it):
+        self.it = it
+        self._buf = None
+    
+    def peek(self):
+        if self._buf is None:
+            self._buf = next(self.it, None)
+        return self._buf
+    
+    def next(self):
+        value = self.peek()
+        self._buf = None
+        return value
 
 def parse_simulation_output(output_text, map_width, map_height):
-    """Parse simulation output text and extract visualization data"""
-    lines = output_text.strip().split('\n')
+    """Parse raw simulation output bytes and extract visualization data"""
+    lines = Peek(iter(output_text.strip().split(b'\n')))
     simulation_data = []
     current_tick = None
     robots_data = {}
     
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
+    while lines.peek() is not None:
+        line = lines.next().strip()
         
         # Parse tick header
-        if line.startswith('=== Tick'):
+        tick_match = _TICK_RE.match(line)
+        if tick_match:
             if current_tick is not None and robots_data:
                 # Save previous tick data
                 simulation_data.append({
@@ -134,63 +182,46 @@ def parse_simulation_output(output_text, map_width, map_height):
                     'phase': robots_data.get(0, {}).get('phase', 'Unknown')
                 })
             
-            current_tick = int(line.split()[2])
+            current_tick = int(tick_match.group(1))
             robots_data = {}
             
         # Parse robot position and phase
-        elif line.startswith('Robot') and 'pos=' in line and 'phase=' in line:
-            parts = line.split()
-            robot_id = int(parts[1].rstrip(':'))
-            
-            # Extract position
-            pos_part = [p for p in parts if p.startswith('pos=')][0]
-            pos_coords = pos_part.split('=')[1].strip('()')
-            x, y = map(int, pos_coords.split(','))
-            
-            # Extract phase
-            phase_part = [p for p in parts if p.startswith('phase=')][0]
-            phase = phase_part.split('=')[1]
+        elif line.startswith(b'Robot') and b'pos=' in line:
+            robot_match = _ROBOT_LINE_RE.match(line)
             
-            robots_data[robot_id] = {
-                'id': robot_id,
-                'position': (x, y),
-                'phase': phase,
-                'map': ['Unexplored'] * (map_width * map_height)
-            }
+            if robot_match:
+                robot_id = int(robot_match.group(1))
+                x, y = int(robot_match.group(2)), int(robot_match.group(3))
+                phase = robot_match.group(4).decode('ascii')
+                
+                robots_data[robot_id] = {
+                    'id': robot_id,
+                    'position': (x, y),
+                    'phase': phase,
+                    'map': np.zeros((map_height, map_width), dtype=np.uint8)
+                }
             
         # Parse robot map
-        elif line.startswith('Robot') and "'s map:" in line:
-            robot_id = int(line.split()[1].rstrip("'s"))
+        elif line.startswith(b'Robot') and b"'s map:" in line:
+            robot_id = int(line.split()[1].rstrip(b"'s"))
             map_lines = []
-            i += 1
             
-            # Read map lines until we hit empty line or next section
-            while i < len(lines) and lines[i].strip() and not lines[i].startswith('Robot') and not lines[i].startswith('==='):
-                map_line = lines[i].rstrip()
-                if map_line and not map_line.startswith(' '):
-                    # Skip coordinate prefixes like " ################## "
-                    if len(map_line) >= map_width:
-                        map_lines.append(map_line)
-                i += 1
-            i -= 1  # Back up one line
+            # Read one line per map row, stopping early at the next section and leaving it for the outer loop.
+            # Unexplored cells print as spaces, so rows may be blank or start with a space; keep them
+            # all (padded back to full width) so the rows below stay aligned
+            while (len(map_lines) < map_height and lines.peek() is not None
+                   and not lines.peek().startswith((b'Robot', b'==='))):
+                map_line = lines.next().rstrip(b'\r')
+                map_lines.append(map_line.ljust(map_width)[:map_width])
             
-            # Convert map to cell states
+            # Convert map to cell states: one bytes -> ndarray copy, then a single lookup
             if robot_id in robots_data and map_lines:
-                cell_map = []
-                for y, map_line in enumerate(map_lines):
-                    for x, char in enumerate(map_line[:map_width]):
-                        if char == '#':
-                            cell_map.append('Obstacle')
-                        elif char == '.':
-                            cell_map.append('Empty')
-                        elif char == 'R':
-                            cell_map.append('Empty')  # Robot position is empty space
-                        else:
-                            cell_map.append('Unexplored')
+                grid = np.frombuffer(b''.join(map_lines), dtype=np.uint8).reshape(len(map_lines), map_width)
                 
-                robots_data[robot_id]['map'] = cell_map
+                cell_map = np.zeros((map_height, map_width), dtype=np.uint8)
+                cell_map[:len(map_lines)] = _CELL_CODES[grid]
                 
-        i += 1
+                robots_data[robot_id]['map'] = cell_map
     
     # Add final tick
     if current_tick is not None and robots_data:
@@ -205,14 +236,14 @@ def parse_simulation_output(output_text, map_width, map_height):
 def run_simulation_and_create_gif(map_file, seed=42, output_gif="exploration.gif"):
     """Run Rust simulation and create GIF visualization"""
     
-    # Run the simulation
+    # Run the simulation; output stays as bytes, which the parser works on directly
     print(f"🚀 Running simulation: {map_file} (seed: {seed})")
     result = subprocess.run([
         '../run_simulation.sh', '--map_file', map_file, '--seed', str(seed)
-    ], capture_output=True, text=True)
+    ], capture_output=True)
     
     if result.returncode != 0:
-        print(f"❌ Simulation failed: {result.stderr}")
+        print(f"❌ Simulation failed: {result.stderr.decode(errors='replace')}")
         return False
     
     # Parse map dimensions from map file